@@ -469,21 +469,22 @@ def build_subscription_tracker(
         key=lambda item: float(cast(float, item["average_amount"])),
         reverse=True,
     )
+    # Totals accumulate in the same pass that builds the rows
+    total_monthly = 0.0
+    total_cumulative = 0.0
     for entry in sorted_monthlies[:top_n]:
         monthly_cost = float(entry["average_amount"])
         if monthly_cost <= 0:
             continue
         months_active = int(entry["occurrences"])
-        subscriptions.append(
-            Subscription(
-                name=str(entry["merchant"]),
-                monthly_cost=monthly_cost,
-                months_active=max(months_active, 1),
-            )
+        subscription = Subscription(
+            name=str(entry["merchant"]),
+            monthly_cost=monthly_cost,
+            months_active=max(months_active, 1),
         )
-
-    total_monthly = sum(sub.monthly_cost for sub in subscriptions)
-    total_cumulative = sum(sub.cumulative_cost for sub in subscriptions)
+        subscriptions.append(subscription)
+        total_monthly += monthly_cost
+        total_cumulative += subscription.cumulative_cost
 
     return SubscriptionTracker(
         title="Subscriptions tracker",
@@ -718,7 +719,13 @@ def build_dashboard_context(
     start_date: date,
     end_date: date,
     api_key: str | None = None,
+    weekly_spend: WeeklySpendSeries | None = None,
 ) -> DashboardContext:
+    """Baseline models plus the AI summary and weekly forecast.
+
+    Pass ``weekly_spend`` when the caller already built the series for the same range,
+    so the forecast is not requested twice.
+    """
     baseline = build_dashboard_baseline(
         transactions,
         start_date=start_date,
@@ -732,12 +739,13 @@ def build_dashboard_context(
         subscriptions=baseline["subscriptions"],
         recurring=baseline["recurring"],
     )
-    weekly_spend = build_weekly_spend_series(
-        baseline["frame"],
-        start_date=start_date,
-        end_date=end_date,
-        api_key=api_key,
-    )
+    if weekly_spend is None:
+        weekly_spend = build_weekly_spend_series(
+            baseline["frame"],
+            start_date=start_date,
+            end_date=end_date,
+            api_key=api_key,
+        )
 
     return {
         "snapshot": baseline["snapshot"],
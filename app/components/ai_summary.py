@@ -5,23 +5,28 @@ from __future__ import annotations
 from collections.abc import Sequence
 from html import escape
 from textwrap import dedent
+from typing import Final
 
 import streamlit as st
 
+_BULLET_ITEM = "<li>{}</li>".format
+_HERO_PILL_HTML: Final[str] = '<span class="pill">AI summary</span>'
+
 
 def render_ai_summary_card(summary_title: str, body: str, bullets: Sequence[str]) -> None:
     """Render the AI hero card with consistent typography and spacing."""
 
-    sanitised_title = escape(summary_title) if summary_title else "AI insights"
-    sanitised_body = escape(body) if body else "Connect your accounts to unlock personalised insights."
-    bullet_items = "".join(f"<li>{escape(point)}</li>" for point in bullets if point and str(point).strip())
+    _esc, _str = escape, str  # local aliases for the per-bullet loop
+    sanitised_title = _esc(summary_title) if summary_title else "AI insights"
+    sanitised_body = _esc(body) if body else "Connect your accounts to unlock personalised insights."
+    bullet_items = "".join([_BULLET_ITEM(_esc(point)) for point in bullets if point and _str(point).strip()])
     bullet_list = f"<ul class='hero__actions'>{bullet_items}</ul>" if bullet_items else ""
 
     hero_html = dedent(
         f"""
         <section class="hero" role="region" aria-label="AI spending summary">
           <div class="hero__content">
-            <span class="pill">AI summary</span>
+            {_HERO_PILL_HTML}
             <h2 class="hero__heading">{sanitised_title}</h2>
             <p class="hero__body">{sanitised_body}</p>
             {bullet_list}
@@ -7,14 +7,45 @@ Previously this module rendered a single combined card. We now expose only:
 from __future__ import annotations
 
 from html import escape
-from textwrap import dedent
+from typing import Final
 
 import streamlit as st
 from core.models import BudgetTracker
 
-
-def _format_currency(value: float) -> str:
-    return f"£{value:,.0f}"
+_ARROW_PREFIXES = ("↑", "↓", "+", "-")
+# (chip class, arrow prefix) indexed by whether the variance is favourable
+_CHIP_VARIANTS: Final[tuple[tuple[str, str], tuple[str, str]]] = (
+    ("chip chip--neg", "↑ "),
+    ("chip chip--pos", "↓ "),
+)
+_SPEND_INSIGHTS_PILL_HTML: Final[str] = '<span class="pill">Spend insights</span>'
+_CARD_FINGERPRINT_KEY = "_budget_card_fingerprint"
+_CARD_HTML_KEY = "_budget_card_html"
+
+# Status copy keyed by whether the projection sits under the chosen budget
+_STATUS_STRINGS: Final[dict[bool, tuple[str, str]]] = {
+    True: ("Under budget", "status-dot status--ok"),
+    False: ("Over budget", "status-dot status--bad"),
+}
+# (spend label, savings label) keyed by (is_month_complete, savings >= 0)
+_METRIC_LABELS: Final[dict[tuple[bool, bool], tuple[str, str]]] = {
+    (True, True): ("Actual spend", "Savings"),
+    (True, False): ("Actual spend", "Overspend"),
+    (False, True): ("Projected spend", "Projected savings"),
+    (False, False): ("Projected spend", "Projected overspend"),
+}
+
+# "Actual vs budget" / "Projected vs budget" blocks: chip class and text for each
+_VARIANCE_HTML: Final[str] = (
+    '<div class="metric-block"><span class="metric-label">Actual vs budget</span>'
+    '<span class="metric-value"><span class="{}">{}</span></span></div>\n'
+    '<div class="metric-block"><span class="metric-label">Projected vs budget</span>'
+    '<span class="metric-value"><span class="{}">{}</span></span></div>\n'
+)
+_NEUTRAL_VARIANCE_HTML: Final[str] = _VARIANCE_HTML.format("chip", "—", "chip", "—")
+
+# Bound once so each call skips the method lookup; output matches f"£{value:,.0f}"
+_format_currency = "£{:,.0f}".format
 
 
 def _format_variance(percent: float, *, is_under_budget: bool) -> str:
@@ -23,38 +54,36 @@ def _format_variance(percent: float, *, is_under_budget: bool) -> str:
 
 
 def _chip_text(label: str, is_positive: bool) -> tuple[str, str]:
-    chip_class = "chip chip--pos" if is_positive else "chip chip--neg"
+    chip_class, prefix = _CHIP_VARIANTS[is_positive]
     clean = label.strip()
-    if clean and clean[0] in {"↑", "↓", "+", "-"}:
+    if clean.startswith(_ARROW_PREFIXES):
         return clean, chip_class
-    prefix = "↓ " if is_positive else "↑ "
     return f"{prefix}{clean}".strip(), chip_class
 
 
-
-def _budget_spend_html(tracker: BudgetTracker, budget_value: float) -> str:
+def _budget_spend_html(
+    title: str,
+    current_spend: float,
+    projected_spend: float,
+    is_month_complete: bool,
+    budget_value: float,
+) -> str:
+    # Pure function of primitive inputs; the session fingerprint below reuses its result across reruns
     # Use the user-chosen budget value for all calculations to keep the UI consistent
     budget = float(max(budget_value, 0.0))
 
-    current_spend = float(tracker.current_spend)
-    projected_spend = float(tracker.projected_or_actual_spend)
-
     # Status is based on projected position vs chosen budget
     projected_is_under = projected_spend <= budget if budget > 0 else False
-    status_label = "Under budget" if projected_is_under else "Over budget"
-    status_dot = "status-dot status--ok" if projected_is_under else "status-dot status--bad"
-
-    spend_label = "Actual spend" if tracker.is_month_complete else "Projected spend"
+    status_label, status_dot = _STATUS_STRINGS[projected_is_under]
 
     # Savings/overspend wording – avoid showing negative savings
     savings_amount = budget - projected_spend
-    if tracker.is_month_complete:
-        savings_label = "Savings" if savings_amount >= 0 else "Overspend"
-    else:
-        savings_label = "Projected savings" if savings_amount >= 0 else "Projected overspend"
+    spend_label, savings_label = _METRIC_LABELS[(is_month_complete, savings_amount >= 0)]
 
-    # Variance percentages vs chosen budget (guard divide by zero)
-    if budget > 0:
+    # Without a positive budget both variance chips are neutral, so reuse the prebuilt markup
+    if budget <= 0:
+        variance_html = _NEUTRAL_VARIANCE_HTML
+    else:
         proj_var_pct = ((projected_spend - budget) / budget) * 100.0
         proj_var_text = _format_variance(proj_var_pct, is_under_budget=projected_is_under)
 
@@ -65,85 +94,58 @@ def _budget_spend_html(tracker: BudgetTracker, budget_value: float) -> str:
         # Build chip content/classes for colored badges
         actual_chip_text, actual_chip_class = _chip_text(actual_var_text, actual_is_under)
         proj_chip_text, proj_chip_class = _chip_text(proj_var_text, projected_is_under)
-    else:
-        proj_var_text = "—"
-        actual_var_text = "—"
-        actual_chip_text = actual_var_text
-        proj_chip_text = proj_var_text
-        actual_chip_class = "chip"
-        proj_chip_class = "chip"
-
-    # Header becomes "Spend insights" (no controls wording)
-    header_html = dedent(
-        f"""
-        <header class="budget-card__header">
-          <div>
-            <span class="pill">Spend insights</span>
-            <h3 class="section-title">{escape(tracker.title)}</h3>
-          </div>
-          <div class="budget-card__status" aria-live="polite">
-            <span class="{status_dot}" aria-hidden="true"></span>
-            <span class="budget-card__status-label">{status_label}</span>
-          </div>
-        </header>
-        """
+        variance_html = _VARIANCE_HTML.format(
+            actual_chip_class, actual_chip_text, proj_chip_class, proj_chip_text
+        )
+
+    # Spend insights card (metrics only); header reads "Spend insights" (no controls wording)
+    return (
+        '<section class="card budget-card" role="region" aria-label="Budget spend insights">\n'
+        '<header class="budget-card__header">\n'
+        f"<div>{_SPEND_INSIGHTS_PILL_HTML}"
+        f'<h3 class="section-title">{escape(title)}</h3></div>\n'
+        '<div class="budget-card__status" aria-live="polite">'
+        f'<span class="{status_dot}" aria-hidden="true"></span>'
+        f'<span class="budget-card__status-label">{status_label}</span>'
+        "</div>\n"
+        "</header>\n"
+        '<div class="metrics budget-card__metrics">\n'
+        '<div class="metric-block"><span class="metric-label">Current spend</span>'
+        f'<span class="metric-value">{_format_currency(current_spend)}</span></div>\n'
+        f'<div class="metric-block"><span class="metric-label">{spend_label}</span>'
+        f'<span class="metric-value">{_format_currency(projected_spend)}</span></div>\n'
+        f'<div class="metric-block"><span class="metric-label">{savings_label}</span>'
+        f'<span class="metric-value">{_format_currency(abs(savings_amount))}</span></div>\n'
+        f"{variance_html}"
+        "</div>\n"
+        "</section>"
     )
 
-    metrics_html = dedent(
-        f"""
-        <div class="metrics budget-card__metrics">
-          <div class="metric-block">
-            <span class="metric-label">Current spend</span>
-            <span class="metric-value">{_format_currency(current_spend)}</span>
-          </div>
-          <div class="metric-block">
-            <span class="metric-label">{escape(spend_label)}</span>
-            <span class="metric-value">{_format_currency(projected_spend)}</span>
-          </div>
-          <div class="metric-block">
-            <span class="metric-label">{escape(savings_label)}</span>
-            <span class="metric-value">{_format_currency(abs(savings_amount))}</span>
-          </div>
-          <div class="metric-block">
-            <span class="metric-label">Actual vs budget</span>
-            <span class="metric-value"><span class="{actual_chip_class}">{actual_chip_text}</span></span>
-          </div>
-          <div class="metric-block">
-            <span class="metric-label">Projected vs budget</span>
-            <span class="metric-value"><span class="{proj_chip_class}">{proj_chip_text}</span></span>
-          </div>
-        </div>
-        """
-    )
-
-    # Spend insights card (metrics only)
-    return dedent(
-        f"""
-        <section class="card budget-card" role="region" aria-label="Budget spend insights">
-          {header_html}
-          {metrics_html}
-        </section>
-        """
-    )
-
-def _left_align_html(s: str) -> str:
-    # prevent Markdown from turning indented HTML into a code block
-    return "\n".join(line.lstrip() for line in s.splitlines())
-
-
-def _get_budget_value(default_value: float) -> float:
-  """Shared getter for the session-stored monthly budget value."""
-  budget_key = "monthly_budget_value"
-  if budget_key not in st.session_state:
-    st.session_state[budget_key] = float(default_value)
-  return float(st.session_state[budget_key])
-
 
 def render_budget_spend_insights(tracker: BudgetTracker) -> None:
   """Render the metrics-only budget spend insights card (right column)."""
-  chosen = _get_budget_value(tracker.allocated_budget)
-  card_html = _budget_spend_html(tracker, chosen)
-  st.markdown(_left_align_html(card_html), unsafe_allow_html=True)
+  state = st.session_state
+  # Shared session-stored monthly budget value, seeded from the tracker on first render
+  budget_key = "monthly_budget_value"
+  if budget_key not in state:
+    state[budget_key] = float(tracker.allocated_budget)
+  chosen = float(state[budget_key])
+  # Reruns triggered by unrelated widgets reuse the last markup instead of rebuilding it
+  fingerprint = (tracker, chosen)
+  if state.get(_CARD_FINGERPRINT_KEY) == fingerprint:
+    card_html = state[_CARD_HTML_KEY]
+  else:
+    # The template is already flush-left, so Markdown won't read it as an indented code block
+    card_html = _budget_spend_html(
+      tracker.title,
+      float(tracker.current_spend),
+      float(tracker.projected_or_actual_spend),
+      tracker.is_month_complete,
+      chosen,
+    )
+    state[_CARD_FINGERPRINT_KEY] = fingerprint
+    state[_CARD_HTML_KEY] = card_html
+  st.markdown(card_html, unsafe_allow_html=True)
 
 
 __all__ = [
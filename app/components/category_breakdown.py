@@ -1,25 +1,45 @@
+"""Render category breakdown inside a Streamlit fragment to avoid whole-page reruns.
+
+When the category selectbox changes, only this fragment re-executes, so the rest of
+the dashboard doesn't visibly refresh.
+
+Performance: the cost here is HTML string assembly and Plotly JSON serialisation, not
+arithmetic, so JIT/Cython-style tooling won't help. Keep work off the rerun path instead:
+chart markup is cached with ``st.cache_data``, the card markup is reused from session state
+for an unchanged summary and selection, formatters are ``lru_cache``'d, and plotly.js is
+loaded once from the CDN rather than inlined.
+"""
+
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Any, Callable, TypeVar
+from datetime import date
+from functools import lru_cache
+from typing import Any, Callable, NamedTuple, TypeVar
 import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components  # for one-shot HTML render
 
 from core.models import CategorySpend, CategorySummary
-from visualization.charts import build_category_chart, build_vendor_chart
-from app.theme import FONT_STACK
+from visualization.charts import build_category_chart, build_vendor_chart_from_arrays
+from app.theme import FONT_STACK, compact_css
 
 # ---------- formatting ----------
-@dataclass(frozen=True)
-class _FormattedMetrics:
+class _FormattedMetrics(NamedTuple):
     this_period: str; share: str; previous: str
     change_amount: str; change_pct: str
     badge_label: str; badge_class: str
 
+# Category figures repeat across reruns and selections, so memoise the formatted strings
+@lru_cache(maxsize=256)
 def _format_currency(x: float) -> str: return f"£{x:,.0f}"
+@lru_cache(maxsize=256)
 def _format_percent(r: float) -> str:   return f"{r*100:.1f}%"
+@lru_cache(maxsize=256)
 def _format_change(a: float) -> str:    return ("+£" if a>0 else "-£" if a<0 else "£")+f"{abs(a):,.0f}"
+@lru_cache(maxsize=256)
 def _format_change_pct(r: float) -> str:return (f"+{r*100:.1f}%" if r>0 else f"{r*100:.1f}%")
+@lru_cache(maxsize=128)
+def _format_range(start: date, end: date) -> str:
+    return f"{start.strftime('%d %b %Y')} – {end.strftime('%d %b %Y')}"
 
 def _status_badge(r: float) -> tuple[str, str]:
     if r < 0:  return "Improved", "status-badge status-badge--improved"
@@ -27,13 +47,13 @@ def _status_badge(r: float) -> tuple[str, str]:
     return "Stable", "status-badge status-badge--neutral"
 
 def _fmt_metrics(c: CategorySpend) -> _FormattedMetrics:
-    badge, cls = _status_badge(getattr(c, "change_pct", 0.0))
+    badge, cls = _status_badge(c.change_pct)
     return _FormattedMetrics(
         this_period=_format_currency(c.amount),
         share=_format_percent(c.share),
         previous=_format_currency(c.previous_amount),
-        change_amount=_format_change(getattr(c, "change_amount", 0.0)),
-        change_pct=_format_change_pct(getattr(c, "change_pct", 0.0)),
+        change_amount=_format_change(c.change_amount),
+        change_pct=_format_change_pct(c.change_pct),
         badge_label=badge, badge_class=cls,
     )
 
@@ -77,7 +97,16 @@ body {
 @media (max-width:900px){.charts-grid{grid-template-columns:1fr;grid-template-areas:"donut" "insights";margin-top:1.6rem}.chart-wrap--donut{min-height:0;padding:0}.chart-wrap--donut > div{min-width:0;max-width:none}}
 </style>
 """
-_CARD_CSS = _CARD_CSS.replace("__FONT_STACK__", FONT_STACK)
+# Components iframes can't see page-level CSS, so the styles travel with each card; build them once
+_CARD_CSS = compact_css(_CARD_CSS.replace("__FONT_STACK__", FONT_STACK)) + "\n"
+_EMPTY_CARD_HTML = _CARD_CSS + """
+<section class="category-card">
+  <div class="category-card__intro">
+    <div class="category-card__pill">Where money went</div>
+    <h2>No spend recorded</h2>
+    <p style="margin:0;font-size:.95rem;color:rgba(15,23,42,.6)">Select another period to review category spend.</p>
+  </div>
+</section>"""
 
 # ---------- card builder ----------
 def _card_html(summary: CategorySummary, selected_name: str,
@@ -95,7 +124,7 @@ def _card_html(summary: CategorySummary, selected_name: str,
   </header>
 
   <div class="category-detail-panel__range" style="margin:.25rem 0 1rem;color:rgba(15,23,42,.6)">
-    Showing spend for {summary.start_date.strftime("%d %b %Y")} – {summary.end_date.strftime("%d %b %Y")} · <strong>{selected_name}</strong>
+    Showing spend for {_format_range(summary.start_date, summary.end_date)} · <strong>{selected_name}</strong>
   </div>
   <div class="charts-grid">
     <div class="chart-wrap chart-wrap--insights">
@@ -120,12 +149,62 @@ def _card_html(summary: CategorySummary, selected_name: str,
 </section>
 """
 
+# ---------- cached chart html ----------
+# Plotly serialisation dominates a render, so cache the embeddable markup rather than the figures
+_CHART_CONFIG = {"displayModeBar": False}
+_CategoryRow = tuple[str, float, float, float, float]
+_CATEGORY_COLUMNS = ("Category", "CurrentValue", "Share", "ChangeAmount", "PctChange")
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _category_chart_html(rows: tuple[_CategoryRow, ...]) -> str:
+    """Donut markup for the category rows; unchanged when only the selected category moves."""
+    category_df = pd.DataFrame.from_records(rows, columns=_CATEGORY_COLUMNS)
+    # Low-cardinality names: dictionary-encode rather than hold one object per cell
+    category_df["Category"] = category_df["Category"].astype("category")
+    fig = build_category_chart(category_df)
+    # plotly.js itself is loaded by the vendor chart, which precedes the donut in the card
+    return fig.to_html(full_html=False, include_plotlyjs=False, config=_CHART_CONFIG)
+
+_VendorColumns = tuple[tuple[str, ...], tuple[float, ...], tuple[float, ...]]
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _vendor_chart_html(columns: _VendorColumns) -> str:
+    """Merchant bar markup for one category; reselecting a category reuses it."""
+    # A handful of merchants: plain column tuples are cheaper than a DataFrame round trip
+    fig = build_vendor_chart_from_arrays(*columns)
+    # Load plotly.js once per iframe from the CDN. The vendor chart sits before the donut in the
+    # card markup, so its (blocking) script tag defines Plotly before the donut's plot call runs.
+    return fig.to_html(full_html=False, include_plotlyjs="cdn", config=_CHART_CONFIG)
+
 # ---------- main render ----------
-"""Render category breakdown inside a Streamlit fragment to avoid whole-page reruns.
+_CARD_FINGERPRINT_KEY = "_category_card_fingerprint"
+_CARD_HTML_KEY = "_category_card_html"
+
+def _build_card(summary: CategorySummary, categories: tuple[CategorySpend, ...],
+                selected: CategorySpend) -> str:
+    metrics = _fmt_metrics(selected)
+    top = selected.merchants[0] if selected.merchants else None
+    top_html = (f"<strong>{top.name}</strong> · {_format_percent(top.share)} of category") if top else "No merchant insights yet"
+
+    # Hashable snapshot of the category list keys the cached donut figure
+    category_rows = tuple(
+        (c.name, c.amount, c.share, c.change_amount, c.change_pct)
+        for c in categories
+    )
+    merchants = selected.merchants
+    vendor_columns = (
+        tuple(m.name for m in merchants),
+        tuple(m.amount for m in merchants),
+        tuple(m.share for m in merchants),
+    )
+
+    # Chart markup is cached on the hashable row snapshots
+    cat_html = _category_chart_html(category_rows)    # donut/pie
+    vend_html = _vendor_chart_html(vendor_columns)    # bars
+
+    # One HTML blob for the entire card
+    return _card_html(summary, selected.name, metrics, top_html, cat_html, vend_html)
 
-When the category selectbox changes, only this fragment re-executes, so the rest of
-the dashboard doesn't visibly refresh.
-"""
 
 T = TypeVar("T", bound=Callable[..., Any])
 
@@ -141,60 +220,38 @@ except AttributeError:
 
 
 @fragment_decorator
-def render_category_breakdown(summary: CategorySummary) -> str:
-    """Selector above-right. One card_html render; donut + bars inside the card."""
+def render_category_breakdown(summary: CategorySummary) -> None:
+    """Selector above-right. One card_html render; donut + bars inside the card.
+
+    The selection lives in ``st.session_state["category_insight_selector"]``; fragment
+    reruns discard return values, so nothing is returned.
+    """
     if not summary.categories:
         # still render a card so layout stays consistent
-        empty_html = _CARD_CSS + """
-        <section class="category-card">
-          <div class="category-card__intro">
-            <div class="category-card__pill">Where money went</div>
-            <h2>No spend recorded</h2>
-            <p style="margin:0;font-size:.95rem;color:rgba(15,23,42,.6)">Select another period to review category spend.</p>
-          </div>
-        </section>"""
-        components.html(empty_html, height=300, scrolling=False)
-        return ""
-
-    categories = list(summary.categories)
-
-    # Selector above the card (right)
-    left, right = st.columns([1.25, 0.75])
-    with right:
-        selected_name = st.selectbox("Category", [c.name for c in categories], index=0, key="category_insight_selector")
+        components.html(_EMPTY_CARD_HTML, height=300, scrolling=False)
+        return
 
-    selected = next(c for c in categories if c.name == selected_name)
-    metrics = _fmt_metrics(selected)
-    top = selected.merchants[0] if selected.merchants else None
-    top_html = (f"<strong>{top.name}</strong> · {_format_percent(top.share)} of category") if top else "No merchant insights yet"
+    categories = tuple(summary.categories)
+    # Category names are unique group keys; the dict keeps display order for the selector
+    by_name = {c.name: c for c in categories}
 
-    # Build dataframes (as before)
-    category_df = pd.DataFrame({
-        "Category": [c.name for c in categories],
-        "CurrentValue": [c.amount for c in categories],
-        "Share": [c.share for c in categories],
-        "ChangeAmount": [getattr(c, "change_amount", 0.0) for c in categories],
-        "PctChange": [getattr(c, "change_pct", 0.0) for c in categories],
-    })
-    vendor_df = pd.DataFrame({
-        "label": [m.name for m in selected.merchants],
-        "amount": [m.amount for m in selected.merchants],
-        "share": [m.share for m in selected.merchants],
-    })
-
-    # Build figures (as before)
-    cat_fig  = build_category_chart(category_df)  # donut/pie
-    vend_fig = build_vendor_chart(vendor_df)      # bars
-
-    # Convert to HTML and embed JS inline so it renders inside the card iframe
-    cat_html = cat_fig.to_html(full_html=False, include_plotlyjs="inline", config={"displayModeBar": False})
-    # Include Plotly.js inline for the vendor chart as well to avoid any race/availability issues
-    vend_html = vend_fig.to_html(full_html=False, include_plotlyjs="inline", config={"displayModeBar": False})
+    # Selector above the card (right); a columns row rather than the st-key-* class, which
+    # older supported Streamlit builds don't emit
+    _left, right = st.columns([1.25, 0.75])
+    with right:
+        selected_name = st.selectbox("Category", tuple(by_name), index=0, key="category_insight_selector")
 
-    # One HTML blob for the entire card
-    card_html = _card_html(summary, selected_name, metrics, top_html, cat_html, vend_html)
+    state = st.session_state
+    # Reruns from unrelated widgets reuse the last card markup for the same summary + selection
+    fingerprint = (summary, selected_name)
+    if state.get(_CARD_FINGERPRINT_KEY) == fingerprint:
+        card_html = state[_CARD_HTML_KEY]
+    else:
+        card_html = _build_card(summary, categories, by_name[selected_name])
+        state[_CARD_FINGERPRINT_KEY] = fingerprint
+        state[_CARD_HTML_KEY] = card_html
 
-    # Render once (reduced height due to side-by-side layout)
+    # Render once (reduced height due to side-by-side layout). Reused markup is byte-identical
+    # (cached chart divs keep their ids), so the frontend keeps the existing iframe rather than
+    # reloading it; a session-held st.empty() would not survive reruns anyway.
     components.html(card_html, height=860, scrolling=False)
-
-    return selected_name
@@ -3,13 +3,64 @@
 from __future__ import annotations
 
 from collections.abc import Mapping, Sequence
+from functools import lru_cache
 from html import escape
-from textwrap import dedent
 
 import streamlit as st
 
 from core.models import MonthlySnapshot, SnapshotMetric
 
+# Fallback badge copy, escaped once at import rather than on every render
+_DEFAULT_BADGE_TOOLTIP_HTML = escape(
+    "Median daily spend over last 90 days, excluding rent & other fixed charges"
+)
+_DEFAULT_BADGE_LABEL_HTML = "Normal for you"
+
+# Flush-left templates, parsed once at import and filled with str.format on each render
+_PRIMARY_TEMPLATE = """\
+<div class="snapshot-card__primary">
+  <span class="snapshot-card__overline">{label}</span>
+  <div class="snapshot-card__value-row">
+    <span class="snapshot-card__value">{value}</span>
+    {delta}
+  </div>
+</div>
+"""
+_METRIC_TEMPLATE = """\
+<div class="snapshot-card__metric">
+  <span class="snapshot-card__metric-label">{label}</span>
+  <span class="snapshot-card__metric-value">{value}</span>
+  {delta}
+</div>
+"""
+_GRID_TEMPLATE = '<div class="snapshot-card__grid">{metrics}</div>'
+_HEADER_TEMPLATE = """\
+<header class="snapshot-card__header">
+  <div>
+    <span class="snapshot-card__period">{period}</span>
+    <h2 class="snapshot-card__title">{title}</h2>
+  </div>
+  <span class="badge snapshot-card__badge" aria-label="Compared to your history" title="{tooltip}">{badge}</span>
+</header>
+"""
+_CARD_TEMPLATE = """\
+<section class="card snapshot-card snapshot-card--modern" role="region" aria-label="Monthly snapshot">
+  {header}
+  {primary}
+  {secondary}
+</section>
+"""
+
+
+def _metric_from_mapping(item: Mapping[str, object]) -> SnapshotMetric:
+    delta = item.get("delta")
+    return SnapshotMetric(
+        label=str(item.get("label", "")),
+        value=str(item.get("value", "")),
+        delta=str(delta) if delta is not None else None,
+        is_positive=item.get("is_positive"),
+    )
+
 
 def _as_snapshot(snapshot: MonthlySnapshot | Mapping[str, object]) -> MonthlySnapshot:
     if isinstance(snapshot, MonthlySnapshot):
@@ -17,105 +68,84 @@ def _as_snapshot(snapshot: MonthlySnapshot | Mapping[str, object]) -> MonthlySna
     if not isinstance(snapshot, Mapping):
         raise TypeError("Snapshot must be a MonthlySnapshot or mapping")
     metrics_raw = snapshot.get("metrics", ())
-    metrics: list[SnapshotMetric] = []
+    metrics: tuple[SnapshotMetric, ...] = ()
     if isinstance(metrics_raw, Sequence):
-        for item in metrics_raw:
-            if isinstance(item, SnapshotMetric):
-                metrics.append(item)
-            elif isinstance(item, Mapping):
-                metrics.append(
-                    SnapshotMetric(
-                        label=str(item.get("label", "")),
-                        value=str(item.get("value", "")),
-                        delta=str(item.get("delta")) if item.get("delta") is not None else None,
-                        is_positive=item.get("is_positive"),
-                    )
-                )
+        metrics = tuple(
+            item if isinstance(item, SnapshotMetric) else _metric_from_mapping(item)
+            for item in metrics_raw
+            if isinstance(item, (SnapshotMetric, Mapping))
+        )
     return MonthlySnapshot(
         title=str(snapshot.get("title", "Monthly snapshot")),
         period_label=str(snapshot.get("period_label", "This period")),
-        metrics=tuple(metrics),
+        metrics=metrics,
         baseline_label=str(snapshot.get("baseline_label")) if snapshot.get("baseline_label") is not None else None,
         baseline_tooltip=str(snapshot.get("baseline_tooltip")) if snapshot.get("baseline_tooltip") is not None else None,
     )
 
 
-def render_snapshot_card(snapshot: MonthlySnapshot | Mapping[str, object]) -> None:
-    """Render the monthly snapshot metrics inside a single `.card` container."""
+# Delta opening tags keyed by (base class, is_positive), built once instead of per metric
+_DELTA_OPEN = {
+    (base_class, is_positive): f'<span class="{base_class} {base_class}--{tone}">'
+    for base_class in ("snapshot-card__delta", "snapshot-card__metric-delta")
+    for is_positive, tone in ((False, "neg"), (True, "pos"))
+}
 
-    resolved = _as_snapshot(snapshot)
-    metrics = list(resolved.metrics)
 
-    def _delta_html(metric: SnapshotMetric, base_class: str) -> str:
-        if not metric.delta:
-            return ""
-        tone = "pos" if bool(getattr(metric, "is_positive", False)) else "neg"
-        return (
-            f'<span class="{base_class} {base_class}--{tone}">{escape(str(metric.delta))}</span>'
-        )
+def _delta_html(metric: SnapshotMetric, base_class: str) -> str:
+    if not metric.delta:
+        return ""
+    # delta is already a str on SnapshotMetric (_as_snapshot coerces mapping input)
+    return _DELTA_OPEN[base_class, bool(metric.is_positive)] + escape(metric.delta) + "</span>"
 
+
+@lru_cache(maxsize=32)
+def _snapshot_html(resolved: MonthlySnapshot) -> str:
+    """Whole-card markup for one snapshot; frozen snapshots hash, so reruns reuse it."""
+
+    metrics = resolved.metrics
     primary_metric: SnapshotMetric | None = metrics[0] if metrics else None
-    supporting_metrics = metrics[1:] if len(metrics) > 1 else []
+    supporting_metrics = metrics[1:]
 
     primary_html = ""
     if primary_metric:
-        primary_html = dedent(
-            f"""\
-<div class="snapshot-card__primary">
-  <span class="snapshot-card__overline">{escape(primary_metric.label)}</span>
-  <div class="snapshot-card__value-row">
-    <span class="snapshot-card__value">{escape(primary_metric.value)}</span>
-    {_delta_html(primary_metric, "snapshot-card__delta")}
-  </div>
-</div>
-"""
+        primary_html = _PRIMARY_TEMPLATE.format(
+            label=escape(primary_metric.label),
+            value=escape(primary_metric.value),
+            delta=_delta_html(primary_metric, "snapshot-card__delta"),
         )
 
-    secondary_blocks: list[str] = []
-    for metric in supporting_metrics:
-        secondary_blocks.append(
-            dedent(
-                f"""\
-<div class="snapshot-card__metric">
-  <span class="snapshot-card__metric-label">{escape(metric.label)}</span>
-  <span class="snapshot-card__metric-value">{escape(metric.value)}</span>
-  {_delta_html(metric, "snapshot-card__metric-delta")}
-</div>
-"""
-            )
+    secondary_blocks = [
+        _METRIC_TEMPLATE.format(
+            label=escape(metric.label),
+            value=escape(metric.value),
+            delta=_delta_html(metric, "snapshot-card__metric-delta"),
         )
-    secondary_html = (
-        f"<div class=\"snapshot-card__grid\">{''.join(secondary_blocks)}</div>"
-        if secondary_blocks
-        else ""
+        for metric in supporting_metrics
+    ]
+    secondary_html = _GRID_TEMPLATE.format(metrics="".join(secondary_blocks)) if secondary_blocks else ""
+
+    baseline_label = resolved.baseline_label
+    baseline_tooltip = resolved.baseline_tooltip
+
+    header_html = _HEADER_TEMPLATE.format(
+        period=escape(resolved.period_label),
+        title=escape(resolved.title),
+        tooltip=escape(baseline_tooltip) if baseline_tooltip else _DEFAULT_BADGE_TOOLTIP_HTML,
+        badge=escape(baseline_label) if baseline_label else _DEFAULT_BADGE_LABEL_HTML,
     )
 
-    # Safely handle older MonthlySnapshot instances that may not have the new fields
-    baseline_label = getattr(resolved, "baseline_label", None)
-    baseline_tooltip = getattr(resolved, "baseline_tooltip", None)
-
-    header_html = dedent(
-        f"""\
-<header class="snapshot-card__header">
-  <div>
-    <span class="snapshot-card__period">{escape(resolved.period_label)}</span>
-    <h2 class="snapshot-card__title">{escape(resolved.title)}</h2>
-  </div>
-  <span class="badge snapshot-card__badge" aria-label="Compared to your history" title="{escape(baseline_tooltip or 'Median daily spend over last 90 days, excluding rent & other fixed charges')}">{escape(baseline_label or 'Normal for you')}</span>
-</header>
-"""
+    return _CARD_TEMPLATE.format(
+        header=header_html,
+        primary=primary_html,
+        secondary=secondary_html,
     )
 
-    card_html = dedent(
-        f"""\
-<section class="card snapshot-card snapshot-card--modern" role="region" aria-label="Monthly snapshot">
-  {header_html}
-  {primary_html}
-  {secondary_html}
-</section>
-"""
-    )
-    st.markdown(card_html, unsafe_allow_html=True)
+
+def render_snapshot_card(snapshot: MonthlySnapshot | Mapping[str, object]) -> None:
+    """Render the monthly snapshot metrics inside a single `.card` container."""
+
+    st.markdown(_snapshot_html(_as_snapshot(snapshot)), unsafe_allow_html=True)
 
 
 __all__ = ["render_snapshot_card"]
@@ -2,132 +2,242 @@
 
 from __future__ import annotations
 
-import pandas as pd
-import plotly.express as px
+import math
+from functools import lru_cache
+from html import escape
+from string import Template
+
+import streamlit as st
 import streamlit.components.v1 as components
 
 from core.models import MonthlyFlow, NetFlowSeries
-from app.theme import FONT_STACK
+from app.theme import FONT_STACK, compact_css
 
 
-# ---- lightweight card CSS (scoped inside iframe) ----
-_CARD_CSS = f"""
+# ---- lightweight card CSS (scoped to the card so it can also render in-page) ----
+_CARD_CSS = compact_css(f"""
 <style>
-:root, html, body {{
+.netflow-card, .netflow-card * {{
   font-family: {FONT_STACK};
 }}
-body {{
-  margin: 0;
-  color: #0f172a;
-  background: transparent;
-}}
-.app-card, .app-card * {{
-  font-family: inherit;
-}}
-.app-card {{background:#fff;border-radius:1.25rem;padding:1.5rem;border:1px solid rgba(148,163,184,.16);
+.netflow-card {{background:#fff;color:#0f172a;border-radius:1.25rem;padding:1.5rem;border:1px solid rgba(148,163,184,.16);
   box-shadow:0 18px 36px rgba(15,23,42,.08);}}
-.app-card__header {{display:flex;justify-content:space-between;align-items:flex-start;gap:1rem;}}
-.pill {{display:inline-flex;align-items:center;padding:.35rem .8rem;border-radius:999px;
+.netflow-card .app-card__header {{display:flex;justify-content:space-between;align-items:flex-start;gap:1rem;margin:0;}}
+.netflow-card .pill {{display:inline-flex;align-items:center;padding:.35rem .8rem;border-radius:999px;
   background:rgba(37,99,235,.10);font-size:.72rem;font-weight:600;letter-spacing:.06em;
   text-transform:uppercase;color:#2563eb;}}
-.app-card__title {{margin:.35rem 0 0;font-size:1.25rem;font-weight:600;color:#0f172a;}}
-.chart-wrap {{margin-top:1rem;}}
-.muted {{color:rgba(15,23,42,.6);}}
+.netflow-card .app-card__title {{margin:.35rem 0 0;padding:0;font-size:1.25rem;font-weight:600;line-height:1.2;color:#0f172a;}}
+.netflow-card .chart-wrap {{margin-top:1rem;}}
+.netflow-card .muted {{color:rgba(15,23,42,.6);}}
+.netflow-svg {{display:block;width:100%;height:380px;}}
+.netflow-svg text {{font-size:12px;fill:rgba(15,23,42,.85);}}
+.netflow-svg .netflow-svg__value {{font-size:11px;}}
 </style>
-"""
+""") + "\n"
+
+# Page reset only needed when the card is isolated in a components.html iframe
+_IFRAME_CSS = "<style>body{margin:0;background:transparent}</style>"
 
 
-def _card_html(series: NetFlowSeries, chart_html: str) -> str:
-    return _CARD_CSS + f"""
-<div class="app-card" role="region" aria-label="Yearly net flow">
+# CSS + card skeleton compiled once; $-placeholders avoid clashing with the CSS braces
+_CARD_TEMPLATE = Template(_CARD_CSS + """
+<div class="app-card netflow-card" role="region" aria-label="Yearly net flow">
   <div class="app-card__header">
     <div>
-      <div class="pill">{series.subtitle}</div>
-      <h3 class="app-card__title">{series.title}</h3>
+      <div class="pill">${subtitle}</div>
+      <h3 class="app-card__title">${title}</h3>
     </div>
   </div>
-
   <div class="chart-wrap">
-    {chart_html}
+    ${chart_html}
   </div>
 </div>
-"""
+""")
+
+
+# Empty state shares the card skeleton with its body already filled in
+_EMPTY_CARD_TEMPLATE = Template(_CARD_TEMPLATE.safe_substitute(
+    chart_html='<p class="muted" style="margin:0;">No monthly net flow data available.</p>'
+))
+
+
+def _card_html(title: str, subtitle: str, chart_html: str) -> str:
+    return _CARD_TEMPLATE.substitute(subtitle=subtitle, title=title, chart_html=chart_html)
+
+
+_FlowRow = tuple[str, float, float]
+
+# Static figure styling, built once; only tick positions/labels vary per series
+_FLOW_COLORS = {"In": "#00ff6a", "Out": "#ff0000"}
+_LAYOUT = {
+    "barmode": "group",
+    "margin": {"l": 70, "r": 10, "t": 10, "b": 40},
+    "legend": {"title": "Type", "orientation": "h", "yanchor": "bottom", "y": 1.02, "xanchor": "right", "x": 1},
+    "xaxis": {"title": "", "tickmode": "array", "tickfont": {"size": 12}, "showgrid": False},
+    "yaxis": {
+        "title": "",
+        "showgrid": True,
+        "gridcolor": "rgba(11,26,51,0.08)",
+        "zerolinecolor": "rgba(11,26,51,0.2)",
+        "tickformat": "£,.0f",
+        "tickfont": {"color": "rgba(15,23,42,0.85)", "size": 12},
+    },
+}
+
+
+# Plotly fallback chart: only the figure JSON is serialised per build. plotly.js comes from the
+# CDN (versioned to the installed plotly, browser-cached) instead of being inlined per payload.
+_PLOTLY_CHART_TEMPLATE = Template(
+    '<div id="netflow-chart" style="height:100%; width:100%;"></div>'
+    '<script charset="utf-8" src="https://cdn.plot.ly/plotly-${version}.min.js"></script>'
+    '<script>var fig = ${figure};'
+    'Plotly.newPlot("netflow-chart", fig.data, fig.layout, {displayModeBar: false, responsive: true});</script>'
+)
+
+# Short series (the dashboard shows 12 months) are drawn as a static SVG; no figure build
+# and no plotly.js download. Longer series fall back to the interactive Plotly chart.
+_SVG_MAX_MONTHS = 24
+_SVG_WIDTH, _SVG_HEIGHT = 1000, 380
+# Top margin leaves room for the rotated value labels above the tallest bars
+_SVG_LEFT, _SVG_TOP, _SVG_RIGHT, _SVG_BOTTOM = 70, 84, 990, 344
+
+
+def _nice_step(peak: float) -> float:
+    """Round a quarter of ``peak`` up to a 1/2/5 x 10^n axis step."""
+    raw = peak / 4
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for factor in (1, 2, 5):
+        if raw <= factor * magnitude:
+            return factor * magnitude
+    return 10 * magnitude
+
+
+def _svg_netflow(months: tuple[_FlowRow, ...]) -> str:
+    """Grouped In/Out bars with value labels as inline SVG; ``<title>`` elements keep per-bar hover values."""
+    peak = max(max(m[1], m[2]) for m in months)
+    step = _nice_step(peak)
+    tick_count = math.ceil(peak / step)
+    scale = (_SVG_BOTTOM - _SVG_TOP) / (step * tick_count)
+    slot = (_SVG_RIGHT - _SVG_LEFT) / len(months)
+    bar = slot * 0.4
+    tick_format = ",.0f" if step >= 1 else ",.2f"
+
+    parts = [
+        f'<svg class="netflow-svg" viewBox="0 0 {_SVG_WIDTH} {_SVG_HEIGHT}" '
+        'role="img" aria-label="Monthly inflow and outflow">'
+    ]
+    append = parts.append
+    for i in range(tick_count + 1):
+        value = step * i
+        y = _SVG_BOTTOM - value * scale
+        stroke = "rgba(11,26,51,0.2)" if i == 0 else "rgba(11,26,51,0.08)"
+        append(
+            f'<line x1="{_SVG_LEFT}" x2="{_SVG_RIGHT}" y1="{y:.1f}" y2="{y:.1f}" stroke="{stroke}"/>'
+            f'<text x="{_SVG_LEFT - 8}" y="{y + 4:.1f}" text-anchor="end">£{value:{tick_format}}</text>'
+        )
+    for i, (month, inflow, outflow) in enumerate(months):
+        month = escape(month)
+        x = _SVG_LEFT + slot * i + slot * 0.1
+        for label, value in (("In", inflow), ("Out", outflow)):
+            height = value * scale
+            top = _SVG_BOTTOM - height
+            centre = x + bar / 2
+            # Grouped bars are too narrow for horizontal labels, so they read bottom-up like Plotly's
+            append(
+                f'<rect x="{x:.1f}" y="{top:.1f}" width="{bar:.1f}" height="{height:.1f}" '
+                f'fill="{_FLOW_COLORS[label]}"><title>{label} · {month}&#10;£{value:,.0f}</title></rect>'
+                f'<text class="netflow-svg__value" x="{centre:.1f}" y="{top - 4:.1f}" dy=".35em" '
+                f'transform="rotate(-90 {centre:.1f} {top - 4:.1f})">£{value:,.0f}</text>'
+            )
+            x += bar
+        append(f'<text x="{_SVG_LEFT + slot * (i + 0.5):.1f}" y="{_SVG_BOTTOM + 22}" text-anchor="middle">{month}</text>')
+
+    # Legend, top right (mirrors the Plotly horizontal legend)
+    legend_x = _SVG_RIGHT - 150
+    append(f'<text x="{legend_x}" y="16">Type</text>')
+    for offset, label in ((44, "In"), (96, "Out")):
+        append(
+            f'<rect x="{legend_x + offset}" y="6" width="12" height="12" fill="{_FLOW_COLORS[label]}"/>'
+            f'<text x="{legend_x + offset + 18}" y="16">{label}</text>'
+        )
+    append("</svg>")
+    return "".join(parts)
+
+
+# In-process memo keyed on the hashable row tuples; no st.cache_data pickling/hashing per rerun
+@lru_cache(maxsize=32)
+def _build_netflow_svg_html(months: tuple[_FlowRow, ...], title: str, subtitle: str) -> str:
+    """Card markup with the static SVG chart; rendered in-page, no iframe needed.
+
+    Goes through ``st.markdown`` rather than ``st.html``, whose sanitiser drops SVG.
+    The template therefore keeps no blank lines inside the card markup.
+    """
+    return _card_html(title, subtitle, _svg_netflow(months))
+
+
+@lru_cache(maxsize=32)
+def _build_netflow_html(months: tuple[_FlowRow, ...], title: str, subtitle: str) -> str:
+    """Full card markup for the (month, inflow, outflow) rows; reused across reruns."""
+    # Deferred: only the interactive fallback needs numpy/plotly
+    import numpy as np
+    import plotly.graph_objects as go
+    from plotly.offline import get_plotlyjs_version
+
+    # Two traces (In/Out) over the same month positions, built directly rather than via a
+    # DataFrame + plotly.express regroup. Numeric x positions keep Plotly from reserving
+    # space for months that were filtered out.
+    n = len(months)
+    month_order = [m[0] for m in months]
+    positions = np.arange(n)
+    inflow = np.fromiter((m[1] for m in months), dtype=np.float64, count=n)
+    outflow = np.fromiter((m[2] for m in months), dtype=np.float64, count=n)
+
+    fig = go.Figure()
+    for label, values in (("In", inflow), ("Out", outflow)):
+        fig.add_bar(
+            name=label,
+            x=positions,
+            y=values,
+            text=values,
+            texttemplate="£%{text:,.0f}",
+            marker_color=_FLOW_COLORS[label],
+            offsetgroup=label,
+            customdata=[(label, month) for month in month_order],
+            hovertemplate="%{customdata[0]} · %{customdata[1]}<br>£%{y:,.0f}<extra></extra>",
+            cliponaxis=False,
+        )
+    fig.update_layout(_LAYOUT)
+    fig.update_xaxes(tickvals=positions, ticktext=month_order)
+
+    chart_html = _PLOTLY_CHART_TEMPLATE.substitute(version=get_plotlyjs_version(), figure=fig.to_json())
+
+    return _IFRAME_CSS + _card_html(title, subtitle, chart_html)
 
 
 def render_yearly_net_flow(series: NetFlowSeries) -> None:
-    """Render grouped bar chart of monthly inflow/outflow inside a single card_html iframe."""
-    # Filter out months with no inflow/outflow
-    months_with_data = [m for m in series.months if (m.inflow != 0 or m.outflow != 0)]
+    """Render grouped bar chart of monthly inflow/outflow as a single card.
+
+    Up to ``_SVG_MAX_MONTHS`` non-negative months render as static SVG; longer
+    series (or negative values) use the Plotly chart in an iframe.
+    """
+    # Filter out months with no inflow/outflow; the hashable rows key the cached card markup
+    months_with_data = tuple(
+        (m.month, m.inflow, m.outflow) for m in series.months if m.inflow or m.outflow
+    )
 
-    # Empty state
+    # Empty state: plain template substitution, no chart work at all
     if not months_with_data:
-        empty_card = _CARD_CSS + f"""
-        <div class="app-card">
-          <div class="app-card__header">
-            <div>
-              <div class="pill">{series.subtitle}</div>
-              <h3 class="app-card__title">{series.title}</h3>
-            </div>
-          </div>
-          <p class="muted" style="margin-top:.75rem;">No monthly net flow data available.</p>
-        </div>
-        """
-        components.html(empty_card, height=180, scrolling=False)
+        st.markdown(
+            _EMPTY_CARD_TEMPLATE.substitute(subtitle=series.subtitle, title=series.title),
+            unsafe_allow_html=True,
+        )
         return
 
-    # Build dataframe only for months that have data
-    df = pd.DataFrame(
-        {
-            "Month": [m.month for m in months_with_data for _ in (0, 1)],
-            "Type": [label for _ in months_with_data for label in ("In", "Out")],
-            "Amount": [value for m in months_with_data for value in (m.inflow, -m.outflow)],
-        }
-    )
-    df["Display"] = df["Amount"].abs()
-
-    # Map months to numeric positions so Plotly won't reserve space for missing months
-    month_order = [m.month for m in months_with_data]
-    month_to_idx = {m: i for i, m in enumerate(month_order)}
-    df["MonthIdx"] = df["Month"].map(month_to_idx)
-
-    # Figure
-    fig = px.bar(
-        df,
-        x="MonthIdx",
-        y="Display",
-        color="Type",
-        barmode="group",
-        color_discrete_map={"In": "#00ff6a", "Out": "#ff0000"},
-        text="Display",
-    )
-    fig.update_traces(
-        texttemplate="£%{text:,.0f}",
-        hovertemplate="%{customdata[0]} · %{customdata[1]}<br>£%{y:,.0f}<extra></extra>",
-        customdata=df[["Type", "Month"]].to_numpy(),
-        cliponaxis=False,
-    )
-    fig.update_layout(
-        margin=dict(l=70, r=10, t=10, b=40),
-        yaxis_title="",
-        xaxis_title="",
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        yaxis=dict(showgrid=True, gridcolor="rgba(11,26,51,0.08)", zerolinecolor="rgba(11,26,51,0.2)"),
-    )
-    fig.update_yaxes(tickformat="£,.0f", tickfont=dict(color="rgba(15,23,42,0.85)", size=12))
-    fig.update_xaxes(
-        tickmode="array",
-        tickvals=list(month_to_idx.values()),
-        ticktext=month_order,
-        tickfont=dict(size=12),
-        showgrid=False,
-    )
-
-    # Inline the chart so a single iframe render contains everything
-    chart_html = fig.to_html(full_html=False, include_plotlyjs="inline", config={"displayModeBar": False})
+    if len(months_with_data) <= _SVG_MAX_MONTHS and all(m[1] >= 0 and m[2] >= 0 for m in months_with_data):
+        st.markdown(_build_netflow_svg_html(months_with_data, series.title, series.subtitle), unsafe_allow_html=True)
+        return
 
-    # Build and render the card in one go
-    card_html = _card_html(series, chart_html)
-    
+    card_html = _build_netflow_html(months_with_data, series.title, series.subtitle)
     components.html(card_html, height=550, scrolling=False)
 
 
@@ -2,117 +2,208 @@
 
 from __future__ import annotations
 
-import pandas as pd
-import plotly.express as px
+from functools import lru_cache
+from html import escape
+from string import Template
+
+import streamlit as st
 import streamlit.components.v1 as components
 
 from core.models import WeeklySpendPoint, WeeklySpendSeries
-from app.theme import FONT_STACK
+from app.theme import FONT_STACK, compact_css
+
+
+_ACTUAL = "Actual"
+_FORECAST = "AI Forecast"
+_COLOR_MAP = {
+    _ACTUAL: "#3c79ff",
+    _FORECAST: "rgba(60, 121, 255, 0.28)",
+}
 
 
-# ---- lightweight card CSS (scoped inside the iframe) ----
-_CARD_CSS = f"""
+# ---- lightweight card CSS (scoped to the card so it can also render in-page) ----
+_CARD_CSS = compact_css(f"""
 <style>
-:root, html, body {{
+.weekly-card, .weekly-card * {{
   font-family: {FONT_STACK};
 }}
-body {{
-  margin: 0;
-  color: #0f172a;
-  background: transparent;
-}}
-.app-card, .app-card * {{
-  font-family: inherit;
-}}
-.app-card {{background:#fff;border-radius:1.25rem;padding:1.5rem;border:1px solid rgba(148,163,184,.16);
+.weekly-card {{background:#fff;color:#0f172a;border-radius:1.25rem;padding:1.5rem;border:1px solid rgba(148,163,184,.16);
   box-shadow:0 18px 36px rgba(15,23,42,.08);}}
-.app-card__header {{display:flex;justify-content:space-between;align-items:flex-start;gap:1rem;}}
-.pill {{display:inline-flex;align-items:center;padding:.35rem .8rem;border-radius:999px;
+.weekly-card .app-card__header {{display:flex;justify-content:space-between;align-items:flex-start;gap:1rem;margin:0;}}
+.weekly-card .pill {{display:inline-flex;align-items:center;padding:.35rem .8rem;border-radius:999px;
   background:rgba(37,99,235,.10);font-size:.72rem;font-weight:600;letter-spacing:.06em;
   text-transform:uppercase;color:#2563eb;}}
-.app-card__title {{margin:.35rem 0 0;font-size:1.25rem;font-weight:600;color:#0f172a;}}
-.chart-wrap {{margin-top:1rem;}}
+.weekly-card .app-card__title {{margin:.35rem 0 0;padding:0;font-size:1.25rem;font-weight:600;line-height:1.2;color:#0f172a;}}
+.weekly-card .chart-wrap {{margin-top:1rem;}}
+.weekly-svg {{display:block;width:100%;height:auto;}}
+.weekly-svg text {{font-size:12px;fill:rgba(15,23,42,.85);}}
 </style>
-"""
+""") + "\n"
 
+# Page reset only needed when the card is isolated in a components.html iframe
+_IFRAME_CSS = "<style>body{margin:0;background:transparent}</style>"
 
-def _card_html(series: WeeklySpendSeries, chart_html: str) -> str:
-    return _CARD_CSS + f"""
-<div class="app-card" role="region" aria-label="Weekly spend">
+
+# Static empty state, built once
+_EMPTY_CARD_HTML = _IFRAME_CSS + _CARD_CSS + """
+<div class="app-card weekly-card">
   <div class="app-card__header">
     <div>
-      <div class="pill">{series.subtitle}</div>
-      <h3 class="app-card__title">{series.title}</h3>
+      <div class="pill">Weekly spend</div>
+      <h3 class="app-card__title">No data</h3>
     </div>
   </div>
+  <p style="margin:.5rem 0 0;color:rgba(15,23,42,.65);">
+    There are no weekly spend points to show.
+  </p>
+</div>
+"""
 
+# CSS + card skeleton compiled once; $-placeholders avoid clashing with the CSS braces
+_CARD_TEMPLATE = Template(_CARD_CSS + """
+<div class="app-card weekly-card" role="region" aria-label="Weekly spend">
+  <div class="app-card__header">
+    <div>
+      <div class="pill">${subtitle}</div>
+      <h3 class="app-card__title">${title}</h3>
+    </div>
+  </div>
   <div class="chart-wrap">
-    {chart_html}
+    ${chart_html}
   </div>
 </div>
-"""
+""")
+
+
+def _card_html(series: WeeklySpendSeries, chart_html: str) -> str:
+    return _CARD_TEMPLATE.substitute(subtitle=series.subtitle, title=series.title, chart_html=chart_html)
+
+
+# A dashboard month is 4-6 weeks; up to this many non-negative points are drawn as a static
+# SVG with no figure build and no plotly.js download. Longer series keep the Plotly chart.
+_SVG_MAX_POINTS = 12
+_SVG_WIDTH, _SVG_HEIGHT = 1000, 420
+_SVG_LEFT, _SVG_TOP, _SVG_RIGHT, _SVG_BOTTOM = 10, 60, 990, 386
+
+
+def _svg_weekly(points: tuple[WeeklySpendPoint, ...]) -> str:
+    """Bars with value labels as inline SVG; ``<title>`` elements keep the hover details."""
+    peak = max(point.amount for point in points) or 1.0
+    scale = (_SVG_BOTTOM - _SVG_TOP) / peak
+    slot = (_SVG_RIGHT - _SVG_LEFT) / len(points)
+    bar = slot * 0.8
+
+    parts = [
+        f'<svg class="weekly-svg" viewBox="0 0 {_SVG_WIDTH} {_SVG_HEIGHT}" '
+        'role="img" aria-label="Spend by week">'
+    ]
+    append = parts.append
+    labels = [_FORECAST if point.is_forecast else _ACTUAL for point in points]
+    for i, (point, label) in enumerate(zip(points, labels)):
+        week = escape(point.week_label)
+        x = _SVG_LEFT + slot * i
+        centre = x + slot / 2
+        height = point.amount * scale
+        top = _SVG_BOTTOM - height
+        append(
+            f'<rect x="{x + slot * 0.1:.1f}" y="{top:.1f}" width="{bar:.1f}" height="{height:.1f}" '
+            f'fill="{_COLOR_MAP[label]}"><title>{week} ({label}): £{point.amount:,.0f}'
+            f'&#10;Confidence: {point.confidence or 0.0:.0%}</title></rect>'
+            f'<text x="{centre:.1f}" y="{top - 6:.1f}" text-anchor="middle">£{point.amount:,.0f}</text>'
+            f'<text x="{centre:.1f}" y="{_SVG_BOTTOM + 22}" text-anchor="middle">{week}</text>'
+        )
+
+    # Legend, top right (mirrors the Plotly horizontal legend); only types present are listed
+    present = [label for label in _COLOR_MAP if label in labels]
+    legend_x = _SVG_RIGHT - 100 * len(present) - 44
+    append(f'<text x="{legend_x}" y="16">Type</text>')
+    for offset, label in enumerate(present):
+        x = legend_x + 44 + offset * 100
+        append(
+            f'<rect x="{x}" y="6" width="12" height="12" fill="{_COLOR_MAP[label]}"/>'
+            f'<text x="{x + 18}" y="16">{label}</text>'
+        )
+    append("</svg>")
+    return "".join(parts)
+
+
+@lru_cache(maxsize=16)
+def _build_svg_card_html(series: WeeklySpendSeries) -> str:
+    """Card markup with the static SVG chart; rendered in-page, no iframe needed.
+
+    Goes through ``st.markdown`` rather than ``st.html``, whose sanitiser drops SVG.
+    The template therefore keeps no blank lines inside the card markup.
+    """
+    return _card_html(series, _svg_weekly(series.points))
+
+
+@lru_cache(maxsize=16)
+def _build_card_html(series: WeeklySpendSeries) -> str:
+    """Chart card markup for one series; frozen series hash, so reruns reuse the string."""
+    # Deferred: only a non-empty series needs numpy/plotly
+    import numpy as np
+    import plotly.graph_objects as go
+
+    # One pass splits the points into the Actual / AI Forecast traces; each trace carries only
+    # its own (type, confidence) customdata so the hover text lines up with its bars
+    traces: dict[str, tuple[list[str], list[float], list[tuple[str, float]]]] = {
+        _ACTUAL: ([], [], []),
+        _FORECAST: ([], [], []),
+    }
+    for point in series.points:
+        label = _FORECAST if point.is_forecast else _ACTUAL
+        weeks, amounts, customdata = traces[label]
+        weeks.append(point.week_label)
+        amounts.append(point.amount)
+        customdata.append((label, point.confidence or 0.0))
+
+    fig = go.Figure()
+    for label, (weeks, amounts, customdata) in traces.items():
+        if not weeks:
+            continue
+        fig.add_bar(
+            name=label,
+            legendgroup=label,
+            showlegend=True,
+            x=weeks,
+            y=np.array(amounts, dtype=np.float64),
+            marker_color=_COLOR_MAP[label],
+            texttemplate="£%{y:,.0f}",
+            textposition="outside",
+            customdata=customdata,
+            hovertemplate="%{x} (%{customdata[0]}): £%{y:,.0f}<br>Confidence: %{customdata[1]:.0%}<extra></extra>",
+            cliponaxis=False,
+        )
+    fig.update_layout(
+        barmode="relative",
+        margin=dict(l=10, r=10, t=10, b=30),
+        xaxis=dict(title="", showgrid=False),
+        yaxis=dict(title="", showgrid=False, visible=False),
+        legend=dict(title="Type", tracegroupgap=0, orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    )
+
+    # plotly.js comes from the CDN (browser-cached) instead of inlining the multi-megabyte
+    # bundle into every payload
+    chart_html = fig.to_html(full_html=False, include_plotlyjs="cdn", config={"displayModeBar": False})
+    return _IFRAME_CSS + _card_html(series, chart_html)
 
 
 def render_weekly_spend(series: WeeklySpendSeries) -> None:
-    """Render spend-by-week as a bar chart inside a single iframe."""
+    """Render spend-by-week as a single bar chart card.
+
+    Up to ``_SVG_MAX_POINTS`` non-negative weeks render in-page as static SVG;
+    longer series use the Plotly chart inside an iframe.
+    """
 
     if not series.points:
-        empty_card = _CARD_CSS + """
-        <div class="app-card">
-          <div class="app-card__header">
-            <div>
-              <div class="pill">Weekly spend</div>
-              <h3 class="app-card__title">No data</h3>
-            </div>
-          </div>
-          <p style="margin:.5rem 0 0;color:rgba(15,23,42,.65);">
-            There are no weekly spend points to show.
-          </p>
-        </div>
-        """
-        components.html(empty_card, height=220, scrolling=False)
+        components.html(_EMPTY_CARD_HTML, height=220, scrolling=False)
         return
 
-    dataframe = pd.DataFrame(
-        {
-            "Week": [point.week_label for point in series.points],
-            "Spend": [point.amount for point in series.points],
-            "Type": ["AI Forecast" if point.is_forecast else "Actual" for point in series.points],
-            "Confidence": [point.confidence for point in series.points],
-        }
-    )
-
-    color_map = {
-        "Actual": "#3c79ff",
-        "AI Forecast": "rgba(60, 121, 255, 0.28)",
-    }
-
-    fig = px.bar(
-        dataframe,
-        x="Week",
-        y="Spend",
-        text="Spend",
-        color="Type",
-        color_discrete_map=color_map,
-    )
-    fig.update_traces(
-        texttemplate="£%{text:,.0f}",
-        textposition="outside",
-        hovertemplate="%{x} (%{customdata[0]}): £%{y:,.0f}<br>Confidence: %{customdata[1]:.0%}<extra></extra>",
-        customdata=dataframe[["Type", "Confidence"]].fillna(0.0).to_numpy(),
-        cliponaxis=False,
-    )
-    fig.update_layout(
-        margin=dict(l=10, r=10, t=10, b=30),
-        yaxis_title="",
-        xaxis_title="",
-        yaxis=dict(showgrid=False, visible=False),
-        xaxis=dict(showgrid=False),
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-    )
+    if len(series.points) <= _SVG_MAX_POINTS and all(point.amount >= 0 for point in series.points):
+        st.markdown(_build_svg_card_html(series), unsafe_allow_html=True)
+        return
 
-    chart_html = fig.to_html(full_html=False, include_plotlyjs="inline", config={"displayModeBar": False})
-    components.html(_card_html(series, chart_html), height=590, scrolling=False)
+    components.html(_build_card_html(series), height=590, scrolling=False)
 
 
 __all__ = ["WeeklySpendPoint", "WeeklySpendSeries", "render_weekly_spend"]
@@ -4,8 +4,11 @@ from __future__ import annotations
 
 from datetime import date, timedelta
 import calendar
+import os
+from dataclasses import dataclass
+from functools import lru_cache
 from textwrap import dedent
-from typing import Any
+from typing import Any, Final, Sequence
 
 import pandas as pd
 import streamlit as st
@@ -21,10 +24,114 @@ from app.components import (
     render_weekly_spend,
     render_yearly_net_flow,
 )
-from analytics.dashboard import build_dashboard_context, build_dashboard_baseline, build_weekly_spend_series
-from core.models import AISummary, AISummaryFocus
+from analytics.dashboard import (
+    DashboardBaseline,
+    DashboardContext,
+    build_dashboard_context,
+    build_dashboard_baseline,
+    build_weekly_spend_series,
+)
+from core.models import AISummary, AISummaryFocus, WeeklySpendSeries
 from core.ai.budget import generate_budget_suggestions, BudgetSuggestion
 
+_BUDGET_SUGGESTION_HELP_HTML: Final[str] = (
+    "<p class='toolbar__helper' style='margin:0;'>Set OPENAI_API_KEY to show an AI recommendation here.</p>"
+)
+
+# Static markup emitted on every rerun, built (and dedented) once at import
+_APP_SHELL_OPEN_HTML: Final[str] = '<main class="app-shell">'
+_HEADER_HTML: Final[str] = dedent(
+    """
+    <div>
+      <h1 class="section-title">Spending overview</h1>
+      <p class="page-subtitle">Preview the upcoming Trading212 spending insights experience.</p>
+    </div>
+    """
+)
+_LAYOUT_GAP_HTML: Final[str] = "<div class='layout-gap'></div>"
+_BUDGET_TARGET_SCOPE_HTML: Final[str] = "<div class='budget-target-scope'></div>"
+_CUSTOM_RANGE_HELP_HTML: Final[str] = (
+    "<p class='input-helper'>Pick any dates. For monthly clarity, choose the 1st to the last day.</p>"
+)
+_LAST_MONTH_HELP_HTML: Final[str] = "<p class='input-helper'>Showing the complete previous calendar month.</p>"
+_THIS_MONTH_HELP_HTML: Final[str] = "<p class='input-helper'>This month to date.</p>"
+
+# Resolve once per process: the widget either exists on this Streamlit build or it doesn't.
+_SEGMENTED_CONTROL = getattr(st, "segmented_control", None)
+
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=8)
+def _dashboard_baseline(transactions: pd.DataFrame, start_date: date, end_date: date) -> DashboardBaseline:
+    """Baseline models per (transactions, range); built once instead of on every widget rerun.
+
+    ``st.cache_data`` hands each caller its own copy, so the cached ``"frame"`` can't leak
+    mutations between sessions.
+    """
+
+    return build_dashboard_baseline(transactions, start_date=start_date, end_date=end_date)
+
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=8)
+def _weekly_spend(transactions: pd.DataFrame, start_date: date, end_date: date) -> WeeklySpendSeries:
+    """Weekly actuals + forecast per (transactions, range); the forecast may call OpenAI."""
+
+    return build_weekly_spend_series(transactions, start_date=start_date, end_date=end_date)
+
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=8)
+def _dashboard_context(
+    transactions: pd.DataFrame,
+    start_date: date,
+    end_date: date,
+    _weekly: WeeklySpendSeries,
+) -> DashboardContext:
+    """AI-enriched context per (transactions, range); widget reruns skip the analytics pipeline.
+
+    The ttl lets a fallback produced during an OpenAI outage age out. ``_weekly`` is
+    derived from the keyed arguments, so it is left out of the cache key.
+    """
+
+    return build_dashboard_context(
+        transactions,
+        start_date=start_date,
+        end_date=end_date,
+        weekly_spend=_weekly,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _BudgetPace:
+    """Month-to-date pace figures behind the budget suggestion prompt."""
+
+    days_in_month: int
+    day_of_month: int
+    days_left: int
+    remaining: float
+    daily_allowance: float
+    avg_so_far: float
+    target_pace: float
+    on_track: bool
+
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=32)
+def _budget_suggestions(
+    context_items: tuple[tuple[str, Any], ...],
+) -> tuple[BudgetSuggestion, list[BudgetSuggestion]]:
+    """AI budget suggestions per rounded analytics snapshot; only changed inputs hit the API.
+
+    Failures raise and so are not cached; the next rerun retries.
+    """
+
+    return generate_budget_suggestions(analytics_context=dict(context_items))
+
+
+def _segmented(label: str, options: Sequence[str], *, key: str, default: str | None = None) -> str | None:
+    """Render a segmented control, falling back to a horizontal radio on older Streamlit."""
+    if _SEGMENTED_CONTROL is not None:
+        return _SEGMENTED_CONTROL(label, options=options, default=default, key=key)
+    index = list(options).index(default) if default in options else None
+    return st.radio(label, options=options, index=index, horizontal=True, key=key)
+
 
 def _coerce_date_range(selection: Any) -> tuple[date, date]:
     if isinstance(selection, (list, tuple)):
@@ -42,6 +149,8 @@ def _coerce_date_range(selection: Any) -> tuple[date, date]:
     return start, end
 
 
+# Pure date helpers: reruns pass the same dates, so results come straight from the memo
+@lru_cache(maxsize=128)
 def _format_range_label(start: date, end: date) -> str:
     if start == end:
         return start.strftime("%b %Y")
@@ -50,6 +159,7 @@ def _format_range_label(start: date, end: date) -> str:
     return f"{start.strftime('%b %Y')} – {end.strftime('%b %Y')}"
 
 
+@lru_cache(maxsize=128)
 def _month_bounds(d: date) -> tuple[date, date]:
     """Return the first and last day for the month containing ``d``."""
     start = d.replace(day=1)
@@ -58,6 +168,7 @@ def _month_bounds(d: date) -> tuple[date, date]:
     return start, end
 
 
+@lru_cache(maxsize=128)
 def _last_month_bounds(today: date) -> tuple[date, date]:
     """Return first/last dates for the previous calendar month relative to ``today``."""
     first_this, _ = _month_bounds(today)
@@ -65,6 +176,29 @@ def _last_month_bounds(today: date) -> tuple[date, date]:
     return _month_bounds(last_prev)
 
 
+@lru_cache(maxsize=32)
+def _budget_pace(today: date, budget_value: float, current_spend: float) -> _BudgetPace:
+    """Derive the pace figures once per (day, target, spend)."""
+    days_in_month = _month_bounds(today)[1].day
+    day_of_month = today.day
+    remaining = max(0.0, budget_value - current_spend)
+    days_left = max(1, days_in_month - day_of_month)
+    # Calendar days are always >= 1, so only days_left above needs a floor
+    avg_so_far = current_spend / day_of_month
+    target_pace = budget_value / days_in_month
+    return _BudgetPace(
+        days_in_month=days_in_month,
+        day_of_month=day_of_month,
+        days_left=days_left,
+        remaining=remaining,
+        daily_allowance=remaining / days_left,
+        avg_so_far=avg_so_far,
+        target_pace=target_pace,
+        on_track=avg_so_far <= target_pace,
+    )
+
+
+@lru_cache(maxsize=128)
 def _days_complete_text(start: date, end: date) -> tuple[str, bool, int]:
     """Return human text for days complete and whether it's a partial month.
 
@@ -86,11 +220,12 @@ def _resolve_focus(
     summary: AISummary,
     key: str,
     fallback: AISummaryFocus,
-) -> tuple[str, list[str], dict[str, AISummaryFocus], AISummaryFocus]:
+) -> tuple[str, tuple[str, ...], dict[str, AISummaryFocus], AISummaryFocus]:
     """Ensure a valid focus is tracked in session state and return helper metadata."""
 
     focus_map = dict(summary.focus_summaries)
-    options = list(summary.focus_options) or list(focus_map.keys())
+    # Widgets accept any sequence, so keep the summary's tuple rather than copying it per rerun
+    options = summary.focus_options or tuple(focus_map)
 
     default_focus = summary.default_focus if summary.default_focus in focus_map else (options[0] if options else "")
 
@@ -112,22 +247,14 @@ def render_dashboard(
 ) -> None:
     """Compose the dashboard layout with shared components and utilities."""
 
-    st.markdown('<main class="app-shell">', unsafe_allow_html=True)
+    # Streamlit renders each markdown call as its own element, so this tag cannot wrap the
+    # widgets below; it only contributes the shell spacing and needs no closing call.
+    st.markdown(_APP_SHELL_OPEN_HTML, unsafe_allow_html=True)
 
     header_left, header_right = st.columns([3, 2], gap="large")
 
     with header_left:
-        st.markdown(
-            dedent(
-                """
-                <div>
-                  <h1 class="section-title">Spending overview</h1>
-                  <p class="page-subtitle">Preview the upcoming Trading212 spending insights experience.</p>
-                </div>
-                """
-            ),
-            unsafe_allow_html=True,
-        )
+        st.markdown(_HEADER_HTML, unsafe_allow_html=True)
 
     min_allowed = min(date(2023, 1, 1), default_date_range[0])
     max_allowed = max(date.today(), default_date_range[1])
@@ -136,7 +263,7 @@ def render_dashboard(
         # Place label + control into a right-side nested column so the control sits to the right
         _spacer, right_side = st.columns([1, 1])
         with right_side:
-            period_mode = st.segmented_control(
+            period_mode = _segmented(
                 "Period",
                 options=["This month", "Last month", "Custom"],
                 key="dashboard_period_mode",
@@ -152,26 +279,17 @@ def render_dashboard(
                     max_value=max_allowed,
                     key="dashboard_period_selector",
                 )
-                st.markdown(
-                    "<p class='input-helper'>Pick any dates. For monthly clarity, choose the 1st to the last day.</p>",
-                    unsafe_allow_html=True,
-                )
+                st.markdown(_CUSTOM_RANGE_HELP_HTML, unsafe_allow_html=True)
             start_date, end_date = _coerce_date_range(selection)
         elif period_mode == "Last month":
             start_date, end_date = _last_month_bounds(date.today())
             with right_side:
-                st.markdown(
-                    "<p class='input-helper'>Showing the complete previous calendar month.</p>",
-                    unsafe_allow_html=True,
-                )
+                st.markdown(_LAST_MONTH_HELP_HTML, unsafe_allow_html=True)
         else:  # This month
             m_start, m_end = _month_bounds(date.today())
             start_date, end_date = m_start, min(m_end, date.today())
             with right_side:
-                st.markdown(
-                    "<p class='input-helper'>This month to date.</p>",
-                    unsafe_allow_html=True,
-                )
+                st.markdown(_THIS_MONTH_HELP_HTML, unsafe_allow_html=True)
 
     range_label = _format_range_label(start_date, end_date)
     days_text, is_partial, observed_days = _days_complete_text(start_date, end_date)
@@ -188,19 +306,11 @@ def render_dashboard(
     )
 
     # Build baseline sync data immediately so the majority of the page can render.
-    baseline = build_dashboard_baseline(
-        transactions,
-        start_date=start_date,
-        end_date=end_date,
-    )
+    baseline = _dashboard_baseline(transactions, start_date, end_date)
 
     ai_placeholder: DeltaGenerator | None = None
     budget_placeholder: DeltaGenerator | None = None
-    baseline_weekly = build_weekly_spend_series(
-        baseline["frame"],
-        start_date=start_date,
-        end_date=end_date,
-    )
+    weekly = _weekly_spend(transactions, start_date, end_date)
 
     def _render_ai_summary(summary: AISummary | None) -> None:
         nonlocal ai_placeholder
@@ -208,20 +318,13 @@ def render_dashboard(
             return
 
         if summary is None:
-            ai_placeholder.empty()
-            ai_placeholder.markdown(
-                """
-                <section class="hero" role="region" aria-label="AI spending summary">
-                  <div class="hero__content">
-                    <span class="pill">AI summary</span>
-                    <h2 class="hero__heading">Generating insights…</h2>
-                    <p class="hero__body">We’re analysing your latest transactions.</p>
-                    <ul class="hero__actions"><li>Hang tight while the AI spins up.</li></ul>
-                  </div>
-                </section>
-                """,
-                unsafe_allow_html=True,
-            )
+            # Loading state reuses the hero builder so the slot receives a single element
+            with ai_placeholder:
+                render_ai_summary_card(
+                    "Generating insights…",
+                    "We’re analysing your latest transactions.",
+                    ("Hang tight while the AI spins up.",),
+                )
             return
 
         ai_placeholder.empty()
@@ -239,7 +342,7 @@ def render_dashboard(
             ) = _resolve_focus(summary, "dashboard_ai_focus", fallback_focus)
 
             if focus_options:
-                selected_focus = st.segmented_control(
+                selected_focus = _segmented(
                     "Insight focus",
                     options=focus_options,
                     default=current_focus if current_focus in focus_options else None,
@@ -267,28 +370,17 @@ def render_dashboard(
         with budget_placeholder.container():
             render_budget_spend_insights(budget_tracker)  # type: ignore[arg-type]
 
-    st.markdown("<div class='layout-gap'></div>", unsafe_allow_html=True)
+    st.markdown(_LAYOUT_GAP_HTML, unsafe_allow_html=True)
 
-    # Compute helper values for budget/AI context using baseline data
-    today = date.today()
-    days_in_month = calendar.monthrange(today.year, today.month)[1]
-    day_of_month = today.day
+    # The pace figures are only needed for the AI suggestion, so they are derived there
     baseline_budget = baseline["budget"]
     budget_value = float(st.session_state.get("monthly_budget_value", baseline_budget.allocated_budget))
-    current_spend = float(baseline_budget.current_spend)
-    remaining = max(0.0, budget_value - current_spend)
-    days_left = max(1, days_in_month - day_of_month)
-    daily_allowance = remaining / days_left
-    avg_so_far = current_spend / max(1, day_of_month)
-    target_pace = budget_value / max(1, days_in_month)
-    on_track = avg_so_far <= target_pace
-    month_complete = bool(getattr(baseline_budget, "is_month_complete", False))
 
     def _render_budget_target_card() -> None:
         """Render the target budget input with AI suggestion inside a single card."""
         with st.container():
             # Scope marker so only this container is styled as a card via CSS
-            st.markdown("<div class='budget-target-scope'></div>", unsafe_allow_html=True)
+            st.markdown(_BUDGET_TARGET_SCOPE_HTML, unsafe_allow_html=True)
             budget_key = "monthly_budget_value"
             pending_key = "pending_budget_value"
             if pending_key in st.session_state:
@@ -308,44 +400,48 @@ def render_dashboard(
             )
 
             suggestion_primary: BudgetSuggestion | None = None
-            try:
-                analytics_context = {
-                    "current_spend": round(current_spend, 2),
-                    "target_budget": round(float(st.session_state.get(budget_key, budget_value)), 2),
-                    "days_in_month": days_in_month,
-                    "day_of_month": day_of_month,
-                    "days_remaining": days_left,
-                    "remaining_budget": round(remaining, 2),
-                    "daily_allowance": round(daily_allowance, 2),
-                    "avg_daily_spend_to_date": round(avg_so_far, 2),
-                    "target_daily_pace": round(target_pace, 2),
-                    "projected_or_actual_spend": round(float(baseline_budget.projected_or_actual_spend), 2),
-                    "is_on_track": on_track,
-                    "is_month_complete": month_complete,
-                }
-                primary, _ = generate_budget_suggestions(analytics_context=analytics_context)
-                suggestion_primary = BudgetSuggestion(primary.label, float(primary.amount), primary.rationale)
-            except Exception:
-                suggestion_primary = None
+            # Without a key the request can only fail, so skip building it at all
+            if os.environ.get("OPENAI_API_KEY"):
+                try:
+                    current_spend = float(baseline_budget.current_spend)
+                    pace = _budget_pace(date.today(), budget_value, current_spend)
+                    analytics_context = {
+                        "current_spend": round(current_spend, 2),
+                        "target_budget": round(float(st.session_state.get(budget_key, budget_value)), 2),
+                        "days_in_month": pace.days_in_month,
+                        "day_of_month": pace.day_of_month,
+                        "days_remaining": pace.days_left,
+                        "remaining_budget": round(pace.remaining, 2),
+                        "daily_allowance": round(pace.daily_allowance, 2),
+                        "avg_daily_spend_to_date": round(pace.avg_so_far, 2),
+                        "target_daily_pace": round(pace.target_pace, 2),
+                        "projected_or_actual_spend": round(float(baseline_budget.projected_or_actual_spend), 2),
+                        "is_on_track": pace.on_track,
+                        "is_month_complete": bool(getattr(baseline_budget, "is_month_complete", False)),
+                    }
+                    # Insertion order is fixed by the literal above, so the items tuple is a stable key
+                    primary, _ = _budget_suggestions(tuple(analytics_context.items()))
+                    suggestion_primary = BudgetSuggestion(primary.label, float(primary.amount), primary.rationale)
+                except Exception:
+                    suggestion_primary = None
 
             if suggestion_primary is not None:
+                # Formatted once; both the helper copy and the button label show the same amount
+                suggested_amount = f"£{suggestion_primary.amount:,.0f}"
+                # Bottom margin stands in for a separate spacer element above the button
                 st.markdown(
-                    f"<p class='toolbar__helper' style='margin:0;'>AI suggestion: <strong>£{suggestion_primary.amount:,.0f}</strong> — {suggestion_primary.rationale}</p>",
+                    f"<p class='toolbar__helper' style='margin:0 0 1rem;'>AI suggestion: <strong>{suggested_amount}</strong> — {suggestion_primary.rationale}</p>",
                     unsafe_allow_html=True,
                 )
-                st.write("")
                 if st.button(
-                    f"Use {suggestion_primary.label} (£{suggestion_primary.amount:,.0f})",
+                    f"Use {suggestion_primary.label} ({suggested_amount})",
                     key="apply_ai_budget_suggestion",
                     help="Apply the AI-recommended budget target",
                 ):
                     st.session_state[pending_key] = float(suggestion_primary.amount)
                     st.rerun()
             else:
-                st.markdown(
-                    "<p class='toolbar__helper' style='margin:0;'>Set OPENAI_API_KEY to show an AI recommendation here.</p>",
-                    unsafe_allow_html=True,
-                )
+                st.markdown(_BUDGET_SUGGESTION_HELP_HTML, unsafe_allow_html=True)
 
     left_col, right_col = st.columns([2, 1], gap="large")
 
@@ -353,51 +449,39 @@ def render_dashboard(
         ai_placeholder = st.empty()
         _render_ai_summary(None)
 
-        st.markdown("<div class='layout-gap'></div>", unsafe_allow_html=True)
+        st.markdown(_LAYOUT_GAP_HTML, unsafe_allow_html=True)
         render_recurring_charges(baseline["recurring"])
 
     with right_col:
         # Budget target card at the very top-right
         _render_budget_target_card()
-        st.markdown("<div class='layout-gap'></div>", unsafe_allow_html=True)
+        st.markdown(_LAYOUT_GAP_HTML, unsafe_allow_html=True)
         render_snapshot_card(baseline["snapshot"])
-        st.markdown("<div class='layout-gap'></div>", unsafe_allow_html=True)
+        st.markdown(_LAYOUT_GAP_HTML, unsafe_allow_html=True)
         budget_placeholder = st.empty()
         _render_budget_insights(baseline_budget)
 
     # Category and lower sections
     render_category_breakdown(baseline["category_summary"])
 
-    st.markdown("<div class='layout-gap'></div>", unsafe_allow_html=True)
+    st.markdown(_LAYOUT_GAP_HTML, unsafe_allow_html=True)
 
     week_col, subs_col = st.columns([1.4, 1], gap="large")
     with week_col:
-        weekly_placeholder = st.empty()
-        with weekly_placeholder.container():
-            render_weekly_spend(baseline_weekly)
+        render_weekly_spend(weekly)
     with subs_col:
         render_subscriptions(baseline["subscriptions"])
 
-    st.markdown("<div class='layout-gap'></div>", unsafe_allow_html=True)
+    st.markdown(_LAYOUT_GAP_HTML, unsafe_allow_html=True)
 
     render_yearly_net_flow(baseline["net_flow"])
 
     # Trigger AI-dependent computations and refresh placeholders once ready
     with st.spinner("Generating AI insights…"):
-        context = build_dashboard_context(
-            transactions,
-            start_date=start_date,
-            end_date=end_date,
-        )
+        context = _dashboard_context(transactions, start_date, end_date, weekly)
 
     _render_ai_summary(context["ai_summary"])
     _render_budget_insights(context["budget"])
 
-    weekly_placeholder.empty()
-    with weekly_placeholder.container():
-        render_weekly_spend(context["weekly_spend"])
-
-    st.markdown("</main>", unsafe_allow_html=True)
-
 
 __all__ = ["render_dashboard"]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
 from textwrap import dedent
 
@@ -1064,10 +1065,24 @@ def build_global_css(palette: Palette = PALETTE) -> str:
 	)
 
 
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+
+
+def compact_css(css: str) -> str:
+	"""Drop comments, indentation and blank lines; stylesheets are resent on every rerun."""
+
+	css = _CSS_COMMENT.sub("", css)
+	return "\n".join(stripped for line in css.splitlines() if (stripped := line.strip()))
+
+
+# The default palette never changes at runtime, so dedent/format the stylesheet once at import.
+_THEME_STYLE_HTML = f"<style>{compact_css(build_global_css())}</style>"
+
+
 def apply_theme() -> None:
 	"""Inject custom CSS into the current Streamlit app."""
 
-	st.markdown(f"<style>{build_global_css()}</style>", unsafe_allow_html=True)
+	st.markdown(_THEME_STYLE_HTML, unsafe_allow_html=True)
 
 
-__all__ = ["PALETTE", "Palette", "apply_theme", "build_global_css"]
+__all__ = ["PALETTE", "Palette", "apply_theme", "build_global_css", "compact_css"]
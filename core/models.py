@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from typing import Mapping, Tuple
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MerchantSpend:
     """Spend contribution from an individual merchant within a category."""
 
@@ -16,7 +16,7 @@ class MerchantSpend:
     share: float  # expressed as decimal (0-1)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CategorySpend:
     """Aggregate spend metrics for a single spending category."""
 
@@ -29,7 +29,7 @@ class CategorySpend:
     merchants: Tuple[MerchantSpend, ...] = ()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CategorySummary:
     """Encapsulates the donut chart and detail card inputs."""
 
@@ -41,7 +41,7 @@ class CategorySummary:
     categories: Tuple[CategorySpend, ...]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SnapshotMetric:
     """Display-ready metric for the monthly snapshot card."""
 
@@ -51,7 +51,7 @@ class SnapshotMetric:
     is_positive: bool | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MonthlySnapshot:
     """Collection of snapshot metrics for a given period."""
 
@@ -95,7 +95,7 @@ class AISummary:
     focus_summaries: Mapping[str, AISummaryFocus]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WeeklySpendPoint:
     week_label: str
     amount: float
@@ -103,25 +103,26 @@ class WeeklySpendPoint:
     confidence: float | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WeeklySpendSeries:
     title: str
     subtitle: str
     points: Tuple[WeeklySpendPoint, ...]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Subscription:
     name: str
     monthly_cost: float
     months_active: int
+    # Derived once at construction; excluded from eq/hash since it follows from the fields above
+    cumulative_cost: float = field(init=False, compare=False)
 
-    @property
-    def cumulative_cost(self) -> float:
-        return self.monthly_cost * self.months_active
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "cumulative_cost", self.monthly_cost * self.months_active)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SubscriptionTracker:
     title: str
     subtitle: str
@@ -130,8 +131,10 @@ class SubscriptionTracker:
     total_cumulative: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RecurringCharge:
+    """Upcoming recurring bill; only ``name`` is free text from transaction descriptions."""
+
     name: str
     amount: float
     cadence: str
@@ -139,21 +142,21 @@ class RecurringCharge:
     status: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RecurringChargesTracker:
     title: str
     subtitle: str
     charges: Tuple[RecurringCharge, ...]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MonthlyFlow:
     month: str
     inflow: float
     outflow: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NetFlowSeries:
     title: str
     subtitle: str